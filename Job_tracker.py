@@ -1,19 +1,151 @@
+import atexit
 import sqlite3
 import csv
-from datetime import datetime
+import sys
+from datetime import date, datetime
 
 DB_NAME = "jobs.db"
 
+_CONN = None
+
+# Applied once when the shared connection is opened.
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL;",
+    "PRAGMA synchronous=NORMAL;",
+    "PRAGMA temp_store=MEMORY;",
+    "PRAGMA cache_size=-64000;",
+    "PRAGMA mmap_size=268435456;",
+)
+
+# Indexes backing the case-insensitive status lookups and date ordering.
+INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_jobs_status_lc ON jobs(lower(status));",
+    "CREATE INDEX IF NOT EXISTS idx_jobs_date ON jobs(applied_date);",
+)
+
+# Full-text index over the searchable columns, kept in sync by triggers.
+FTS_TABLE = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+        company, role, location,
+        content='jobs', content_rowid='id'
+    );
+"""
+
+FTS_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN
+        INSERT INTO jobs_fts (rowid, company, role, location)
+        VALUES (new.id, new.company, new.role, new.location);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN
+        INSERT INTO jobs_fts (jobs_fts, rowid, company, role, location)
+        VALUES ('delete', old.id, old.company, old.role, old.location);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_au
+    AFTER UPDATE OF company, role, location ON jobs BEGIN
+        INSERT INTO jobs_fts (jobs_fts, rowid, company, role, location)
+        VALUES ('delete', old.id, old.company, old.role, old.location);
+        INSERT INTO jobs_fts (rowid, company, role, location)
+        VALUES (new.id, new.company, new.role, new.location);
+    END;
+    """,
+)
+
+# SQL statements, kept at module level so each call reuses the same text.
+SQL_INSERT_JOB = """
+    INSERT INTO jobs (company, role, location, applied_date, status, salary, notes)
+    VALUES (?, ?, ?, ?, ?, ?, ?);
+"""
+
+SQL_LIST_JOBS = """
+    SELECT id, company, role, location, applied_date, status, salary
+    FROM jobs
+    ORDER BY id DESC;
+"""
+
+SQL_JOBS_BY_STATUS = """
+    SELECT id, company, role, location, applied_date, status, salary
+    FROM jobs
+    WHERE LOWER(status) = ?;
+"""
+
+SQL_STATS = """
+    SELECT 'total', NULL, COUNT(*)
+    FROM jobs
+    UNION ALL
+    SELECT 'status', status, COUNT(*)
+    FROM jobs
+    GROUP BY status
+    UNION ALL
+    SELECT * FROM (
+        SELECT 'company', company, COUNT(*)
+        FROM jobs
+        GROUP BY company
+        ORDER BY COUNT(*) DESC
+        LIMIT 5
+    );
+"""
+
+SQL_GET_JOB = """
+    SELECT id, company, role, location, applied_date, status, salary, notes
+    FROM jobs
+    WHERE id = ?;
+"""
+
+SQL_UPDATE_JOB = """
+    UPDATE jobs
+    SET status = ?, applied_date = ?, salary = ?, notes = ?
+    WHERE id = ?;
+"""
+
+SQL_DELETE_JOB = "DELETE FROM jobs WHERE id = ?;"
+
+SQL_SEARCH_JOBS = """
+    SELECT j.id, j.company, j.role, j.location, j.applied_date, j.status, j.salary
+    FROM jobs j
+    JOIN jobs_fts f ON f.rowid = j.id
+    WHERE jobs_fts MATCH ?
+    ORDER BY j.id DESC;
+"""
+
+SQL_EXPORT_JOBS = """
+    SELECT id, company, role, location, applied_date, status, salary, notes
+    FROM jobs
+    ORDER BY id DESC;
+"""
+
 
 def get_connection():
-    """Create and return a database connection."""
-    conn = sqlite3.connect(DB_NAME)
-    return conn
+    """Return the shared database connection, opening it on first use."""
+    global _CONN
+    if _CONN is None:
+        _CONN = sqlite3.connect(DB_NAME, check_same_thread=False)
+        for pragma in PRAGMAS:
+            _CONN.execute(pragma)
+    return _CONN
 
 
-def create_table():
-    """Create the jobs table if it does not exist."""
-    conn = get_connection()
+def close_connection():
+    """Close the shared database connection if it is open."""
+    global _CONN
+    if _CONN is not None:
+        _CONN.close()
+        _CONN = None
+
+
+atexit.register(close_connection)
+
+
+def create_schema(conn):
+    """Create the jobs table, its indexes and the search index if missing.
+
+    Shared with the Streamlit app so both front ends build the same schema
+    and FTS triggers on jobs.db.
+    """
     cursor = conn.cursor()
 
     cursor.execute(
@@ -31,11 +163,70 @@ def create_table():
         """
     )
 
+    for index_sql in INDEXES:
+        cursor.execute(index_sql)
+
+    # build the full-text index from existing rows the first time it is created
+    cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs_fts';")
+    fts_exists = cursor.fetchone() is not None
+
+    cursor.execute(FTS_TABLE)
+    for trigger_sql in FTS_TRIGGERS:
+        cursor.execute(trigger_sql)
+
+    if not fts_exists:
+        cursor.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild');")
+
     conn.commit()
-    conn.close()
+
+
+def create_table():
+    """Create the jobs table if it does not exist."""
+    create_schema(get_connection())
     print("Table created successfully")
 
 
+# ---------- INPUT HELPERS ----------
+
+def normalize_date(text):
+    """Return a date as canonical YYYY-MM-DD; blank values pass through.
+
+    Raises ValueError if the date is not in ISO format.
+    """
+    if not text:
+        return text
+    return date.fromisoformat(text.strip()).isoformat()
+
+
+# ---------- DISPLAY HELPERS ----------
+
+# layout of one listing line, shared by the header and every row
+_ROW_FORMAT = "{:<4} {:<20} {:<20} {:<12} {:<12} {:<12} {:<10}".format
+
+
+def format_job_table(rows):
+    """Return the job listing table (header + one line per row) as one string."""
+    lines = [
+        _ROW_FORMAT("ID", "Company", "Role", "Location",
+                    "Date", "Status", "Salary"),
+        "-" * 95,
+    ]
+
+    for row in rows:
+        job_id, company, role, location, applied_date, status, salary = row
+
+        location = location if location else "-"
+        applied_date = applied_date if applied_date else "-"
+        status = status if status else "-"
+        salary_str = f"{salary:.0f}" if salary is not None else "-"
+
+        lines.append(_ROW_FORMAT(job_id, company[:18], role[:18], location[:10],
+                                 applied_date, status[:10], salary_str))
+
+    return "\n".join(lines)
+
+
 # ---------- CORE ACTIONS ----------
 
 def add_job():
@@ -66,62 +257,59 @@ def add_job():
             print("Invalid salary entered. Saving salary as empty.")
             salary = None
 
-    conn = get_connection()
-    cursor = conn.cursor()
+    # Store dates as canonical YYYY-MM-DD so they sort and index correctly
+    try:
+        applied_date = normalize_date(applied_date)
+    except ValueError:
+        print("Invalid date entered (use YYYY-MM-DD). Saving date as empty.")
+        applied_date = ""
 
-    cursor.execute(
-        """
-        INSERT INTO jobs (company, role, location, applied_date, status, salary, notes)
-        VALUES (?, ?, ?, ?, ?, ?, ?);
-        """,
-        (company, role, location, applied_date, status, salary, notes)
-    )
+    conn = get_connection()
 
-    conn.commit()
-    conn.close()
+    with conn:
+        conn.execute(
+            SQL_INSERT_JOB,
+            (company, role, location, applied_date, status, salary, notes)
+        )
 
     print("✅ Job application saved successfully!")
 
 
+def insert_jobs_bulk(rows):
+    """Insert many job rows in a single transaction.
+
+    Each row is a (company, role, location, applied_date, status, salary, notes)
+    tuple. Dates are normalized first, so a row with an invalid date raises
+    ValueError before anything is written. Returns the number of rows inserted.
+    """
+    rows = [
+        (company, role, location, normalize_date(applied_date), status, salary, notes)
+        for company, role, location, applied_date, status, salary, notes in rows
+    ]
+
+    conn = get_connection()
+
+    with conn:
+        cursor = conn.executemany(SQL_INSERT_JOB, rows)
+
+    return cursor.rowcount
+
+
 def view_all_jobs():
     """Fetch and display all job applications from the database."""
     conn = get_connection()
     cursor = conn.cursor()
 
-    cursor.execute(
-        """
-        SELECT id, company, role, location, applied_date, status, salary
-        FROM jobs
-        ORDER BY id DESC;
-        """
-    )
+    cursor.execute(SQL_LIST_JOBS)
 
     rows = cursor.fetchall()
-    conn.close()
 
     if not rows:
         print("\nNo job applications found yet.")
         return
 
     print("\n=== All Job Applications ===")
-    print(
-        f"{'ID':<4} {'Company':<20} {'Role':<20} {'Location':<12} "
-        f"{'Date':<12} {'Status':<12} {'Salary':<10}"
-    )
-    print("-" * 95)
-
-    for row in rows:
-        job_id, company, role, location, applied_date, status, salary = row
-
-        location = location if location else "-"
-        applied_date = applied_date if applied_date else "-"
-        status = status if status else "-"
-        salary_str = f"{salary:.0f}" if salary is not None else "-"
-
-        print(
-            f"{job_id:<4} {company[:18]:<20} {role[:18]:<20} {location[:10]:<12} "
-            f"{applied_date:<12} {status[:10]:<12} {salary_str:<10}"
-        )
+    print(format_job_table(rows))
 
 
 def view_by_status():
@@ -139,41 +327,16 @@ def view_by_status():
     conn = get_connection()
     cursor = conn.cursor()
 
-    cursor.execute(
-        """
-        SELECT id, company, role, location, applied_date, status, salary
-        FROM jobs
-        WHERE LOWER(status) = ?;
-        """,
-        (status_clean,)
-    )
+    cursor.execute(SQL_JOBS_BY_STATUS, (status_clean,))
 
     rows = cursor.fetchall()
-    conn.close()
 
     if not rows:
         print(f"\nNo applications found with status: {status_input}")
         return
 
     print(f"\n=== Applications with status: {status_input} ===")
-    print(
-        f"{'ID':<4} {'Company':<20} {'Role':<20} {'Location':<12} "
-        f"{'Date':<12} {'Status':<12} {'Salary':<10}"
-    )
-    print("-" * 95)
-
-    for row in rows:
-        job_id, company, role, location, applied_date, status, salary = row
-
-        location = location if location else "-"
-        applied_date = applied_date if applied_date else "-"
-        status = status if status else "-"
-        salary_str = f"{salary:.0f}" if salary is not None else "-"
-
-        print(
-            f"{job_id:<4} {company[:18]:<20} {role[:18]:<20} {location[:10]:<12} "
-            f"{applied_date:<12} {status[:10]:<12} {salary_str:<10}"
-        )
+    print(format_job_table(rows))
 
 
 def show_stats():
@@ -181,33 +344,20 @@ def show_stats():
     conn = get_connection()
     cursor = conn.cursor()
 
-    # total applications
-    cursor.execute("SELECT COUNT(*) FROM jobs;")
-    total = cursor.fetchone()[0]
-
-    # count by status
-    cursor.execute(
-        """
-        SELECT status, COUNT(*)
-        FROM jobs
-        GROUP BY status;
-        """
-    )
-    status_counts = cursor.fetchall()
-
-    # top companies
-    cursor.execute(
-        """
-        SELECT company, COUNT(*)
-        FROM jobs
-        GROUP BY company
-        ORDER BY COUNT(*) DESC
-        LIMIT 5;
-        """
-    )
-    top_companies = cursor.fetchall()
-
-    conn.close()
+    # total, count by status and top companies in one round-trip;
+    # the first column tags which section each row belongs to
+    cursor.execute(SQL_STATS)
+
+    total = 0
+    status_counts = []
+    top_companies = []
+    for kind, label, count in cursor:
+        if kind == "total":
+            total = count
+        elif kind == "status":
+            status_counts.append((label, count))
+        else:
+            top_companies.append((label, count))
 
     print("\n=== Application Summary ===")
     print(f"Total applications: {total}")
@@ -231,16 +381,8 @@ def get_job_by_id(job_id):
     """Return a single job row by ID, or None."""
     conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute(
-        """
-        SELECT id, company, role, location, applied_date, status, salary, notes
-        FROM jobs
-        WHERE id = ?;
-        """,
-        (job_id,)
-    )
+    cursor.execute(SQL_GET_JOB, (job_id,))
     row = cursor.fetchone()
-    conn.close()
     return row
 
 
@@ -282,6 +424,12 @@ def update_job():
         new_status = status
     if new_date == "":
         new_date = applied_date
+    else:
+        try:
+            new_date = normalize_date(new_date)
+        except ValueError:
+            print("Invalid date entered (use YYYY-MM-DD). Keeping old date.")
+            new_date = applied_date
     if new_notes == "":
         new_notes = notes
 
@@ -295,19 +443,12 @@ def update_job():
             new_salary = salary
 
     conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        """
-        UPDATE jobs
-        SET status = ?, applied_date = ?, salary = ?, notes = ?
-        WHERE id = ?;
-        """,
-        (new_status, new_date, new_salary, new_notes, job_id)
-    )
 
-    conn.commit()
-    conn.close()
+    with conn:
+        conn.execute(
+            SQL_UPDATE_JOB,
+            (new_status, new_date, new_salary, new_notes, job_id)
+        )
     print("✅ Job updated successfully!")
 
 
@@ -335,13 +476,17 @@ def delete_job():
         return
 
     conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM jobs WHERE id = ?;", (job_id,))
-    conn.commit()
-    conn.close()
+    with conn:
+        conn.execute(SQL_DELETE_JOB, (job_id,))
     print("🗑️ Job deleted successfully!")
 
 
+def fts_query(keyword):
+    """Turn free text into an FTS5 query matching every word as a prefix."""
+    words = keyword.split()
+    return " ".join('"' + word.replace('"', '""') + '"*' for word in words)
+
+
 def search_jobs():
     """Search jobs by keyword in company, role or location."""
     print("\n=== Search Jobs ===")
@@ -355,46 +500,16 @@ def search_jobs():
     conn = get_connection()
     cursor = conn.cursor()
 
-    like_pattern = f"%{keyword}%"
-
-    cursor.execute(
-        """
-        SELECT id, company, role, location, applied_date, status, salary
-        FROM jobs
-        WHERE LOWER(company) LIKE ?
-           OR LOWER(role) LIKE ?
-           OR LOWER(location) LIKE ?
-        ORDER BY id DESC;
-        """,
-        (like_pattern, like_pattern, like_pattern)
-    )
+    cursor.execute(SQL_SEARCH_JOBS, (fts_query(keyword),))
 
     rows = cursor.fetchall()
-    conn.close()
 
     if not rows:
         print(f"\nNo jobs found matching: {keyword}")
         return
 
     print(f"\n=== Search results for '{keyword}' ===")
-    print(
-        f"{'ID':<4} {'Company':<20} {'Role':<20} {'Location':<12} "
-        f"{'Date':<12} {'Status':<12} {'Salary':<10}"
-    )
-    print("-" * 95)
-
-    for row in rows:
-        job_id, company, role, location, applied_date, status, salary = row
-
-        location = location if location else "-"
-        applied_date = applied_date if applied_date else "-"
-        status = status if status else "-"
-        salary_str = f"{salary:.0f}" if salary is not None else "-"
-
-        print(
-            f"{job_id:<4} {company[:18]:<20} {role[:18]:<20} {location[:10]:<12} "
-            f"{applied_date:<12} {status[:10]:<12} {salary_str:<10}"
-        )
+    print(format_job_table(rows))
 
 
 def export_to_csv():
@@ -402,18 +517,12 @@ def export_to_csv():
     conn = get_connection()
     cursor = conn.cursor()
 
-    cursor.execute(
-        """
-        SELECT id, company, role, location, applied_date, status, salary, notes
-        FROM jobs
-        ORDER BY id DESC;
-        """
-    )
+    cursor.execute(SQL_EXPORT_JOBS)
 
-    rows = cursor.fetchall()
-    conn.close()
+    # stream rows straight from the cursor instead of loading them all
+    first_row = cursor.fetchone()
 
-    if not rows:
+    if first_row is None:
         print("\nNo jobs to export.")
         return
 
@@ -423,9 +532,60 @@ def export_to_csv():
         writer = csv.writer(f)
         writer.writerow(["ID", "Company", "Role", "Location",
                         "Applied Date", "Status", "Salary", "Notes"])
-        writer.writerows(rows)
+        writer.writerow(first_row)
+        count = 1
+        for row in cursor:
+            writer.writerow(row)
+            count += 1
+
+    print(f"📁 Exported {count} jobs to {filename}")
+
+
+# ---------- BULK ANALYTICS ----------
+
+def category_counts(column):
+    """Count a categorical column in one pass; missing values map to 'Unknown'."""
+    import numpy as np
+
+    # shift codes by one so missing values (code -1) land in slot 0
+    codes = column.cat.codes.to_numpy() + 1
+    counts = np.bincount(codes, minlength=len(column.cat.categories) + 1)
+    labels = ["Unknown", *column.cat.categories]
+    return labels, counts
+
+
+def analyze_csv(path):
+    """Show summary statistics for an exported CSV, however large."""
+    # pandas is only needed here, so the interactive tracker stays lightweight
+    import pandas as pd
+
+    try:
+        df = pd.read_csv(path, usecols=["Status", "Company"], dtype="category")
+    except OSError as e:
+        print(f"❌ Could not read {path}: {e.strerror or e}")
+        return
+    except ValueError:
+        print(f"❌ {path} is not a job export (needs Status and Company columns).")
+        return
+    total = len(df)
+
+    print(f"\n=== Application Summary ({path}) ===")
+    print(f"Total applications: {total}")
+
+    if total == 0:
+        return
 
-    print(f"📁 Exported {len(rows)} jobs to {filename}")
+    print("\nBy status:")
+    labels, counts = category_counts(df["Status"])
+    for label, count in zip(labels, counts):
+        if count:
+            print(f"  {label}: {count}")
+
+    print("\nTop companies you applied to:")
+    labels, counts = category_counts(df["Company"])
+    for i in (-counts).argsort(kind="stable")[:5]:
+        if counts[i]:
+            print(f"  {labels[i]}: {counts[i]}")
 
 
 # ---------- MENU & MAIN LOOP ----------
@@ -479,4 +639,10 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1 and sys.argv[1] == "analyze":
+        if len(sys.argv) != 3:
+            print("Usage: python Job_tracker.py analyze <exported_csv>")
+            sys.exit(2)
+        analyze_csv(sys.argv[2])
+    else:
+        main()
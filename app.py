@@ -1,114 +1,241 @@
 import sqlite3
-from datetime import datetime
 
-import pandas as pd
 import streamlit as st
 
-DB_NAME = "jobs.db"
+from Job_tracker import (
+    DB_NAME,
+    PRAGMAS,
+    SQL_DELETE_JOB,
+    SQL_GET_JOB,
+    SQL_INSERT_JOB,
+    SQL_UPDATE_JOB,
+    create_schema,
+    normalize_date,
+)
+
+# Dashboard-only SQL statements; the schema and CRUD statements are shared
+# with the CLI through Job_tracker.
+SQL_LIST_JOBS = """
+    SELECT id, company, role, location, applied_date, status, salary, notes
+    FROM jobs
+    ORDER BY id DESC;
+"""
+
+SQL_STATUS_COUNTS = """
+    SELECT MIN(status), COUNT(*)
+    FROM jobs
+    GROUP BY lower(status)
+    ORDER BY COUNT(*) DESC;
+"""
+
+SQL_TOP_COMPANIES = """
+    SELECT company, COUNT(*)
+    FROM jobs
+    GROUP BY company
+    ORDER BY COUNT(*) DESC
+    LIMIT 10;
+"""
+
+SQL_DISTINCT_STATUSES = """
+    SELECT DISTINCT status
+    FROM jobs
+    WHERE status IS NOT NULL
+    ORDER BY status;
+"""
+
+SQL_DISTINCT_COMPANIES = """
+    SELECT DISTINCT company
+    FROM jobs
+    WHERE company IS NOT NULL
+    ORDER BY company;
+"""
 
 
 # ---------- DATABASE HELPERS ----------
 
+def casefold_text(value):
+    """Unicode-aware case folding, registered as the SQL casefold() function."""
+    return value.casefold() if isinstance(value, str) else value
+
+
+@st.cache_resource
 def get_connection():
-    """Create and return a database connection."""
-    conn = sqlite3.connect(DB_NAME)
+    """Return a database connection shared across Streamlit reruns."""
+    conn = sqlite3.connect(DB_NAME, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    # SQLite's lower() only folds ASCII; casefold() handles e.g. "École"
+    conn.create_function("casefold", 1, casefold_text, deterministic=True)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
     return conn
 
 
 def create_table():
-    """Create the jobs table if it does not exist (same as CLI app)."""
+    """Create the jobs table if it does not exist (same schema as CLI app)."""
+    create_schema(get_connection())
+
+
+def read_jobs_frame(query, params=()):
+    """Run a jobs query and build a DataFrame straight from the cursor."""
+    import pandas as pd  # only the read paths need pandas
+
     conn = get_connection()
     cursor = conn.cursor()
+    cursor.row_factory = None  # plain tuples are cheapest for from_records
+    cursor.execute(query, params)
+    columns = [col[0] for col in cursor.description]
+    df = pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
+    if "salary" in df:
+        df["salary"] = df["salary"].astype("float64")
+    return df
 
-    cursor.execute(
-        """
-        CREATE TABLE IF NOT EXISTS jobs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            company TEXT NOT NULL,
-            role TEXT NOT NULL,
-            location TEXT,
-            applied_date TEXT,
-            status TEXT,
-            salary REAL,
-            notes TEXT
-        );
-        """
-    )
 
-    conn.commit()
-    conn.close()
+@st.cache_data(ttl=300)
+def fetch_all_jobs():
+    """Return all jobs as a pandas DataFrame (cached until the next write)."""
+    df = read_jobs_frame(SQL_LIST_JOBS)
+    return df
 
 
-def fetch_all_jobs():
-    """Return all jobs as a pandas DataFrame."""
-    conn = get_connection()
-    query = """
+@st.cache_data(ttl=300)
+def fetch_jobs(status_filter=None, company_filter=None, search=None):
+    """Return jobs matching the dashboard filters as a pandas DataFrame.
+
+    Empty filters are ignored; ``search`` is a case-insensitive (Unicode
+    casefolded) substring match on company, role or location.
+    """
+    conditions = []
+    params = []
+
+    if status_filter:
+        conditions.append(f"status IN ({', '.join('?' * len(status_filter))})")
+        params.extend(status_filter)
+    if company_filter:
+        conditions.append(
+            f"company IN ({', '.join('?' * len(company_filter))})")
+        params.extend(company_filter)
+    if search:
+        escaped = (search.casefold()
+                   .replace("\\", "\\\\")
+                   .replace("%", "\\%")
+                   .replace("_", "\\_"))
+        like_pattern = f"%{escaped}%"
+        conditions.append(
+            "(casefold(company) LIKE ? ESCAPE '\\'"
+            " OR casefold(role) LIKE ? ESCAPE '\\'"
+            " OR casefold(location) LIKE ? ESCAPE '\\')"
+        )
+        params.extend([like_pattern] * 3)
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    query = f"""
         SELECT id, company, role, location, applied_date, status, salary, notes
         FROM jobs
+        {where}
         ORDER BY id DESC;
     """
-    df = pd.read_sql_query(query, conn)
-    conn.close()
+    df = read_jobs_frame(query, params)
     return df
 
 
+@st.cache_data(ttl=300)
+def fetch_status_counts():
+    """Return (status, count) pairs, grouped case-insensitively, largest first.
+
+    A missing status is returned as None; blank and NULL stay separate groups.
+    """
+    conn = get_connection()
+    cursor = conn.execute(SQL_STATUS_COUNTS)
+    return [(status, count) for status, count in cursor]
+
+
+@st.cache_data(ttl=300)
+def fetch_top_companies():
+    """Return (company, count) pairs for the ten most-applied companies."""
+    conn = get_connection()
+    cursor = conn.execute(SQL_TOP_COMPANIES)
+    return [(company, count) for company, count in cursor]
+
+
+@st.cache_data(ttl=300)
+def fetch_filter_options():
+    """Return the sorted distinct (statuses, companies) for the sidebar filters."""
+    conn = get_connection()
+    statuses = [row[0] for row in conn.execute(SQL_DISTINCT_STATUSES)]
+    companies = [row[0] for row in conn.execute(SQL_DISTINCT_COMPANIES)]
+    return statuses, companies
+
+
+def clear_cached_queries():
+    """Drop cached query results after the jobs table changes."""
+    fetch_all_jobs.clear()
+    fetch_jobs.clear()
+    fetch_status_counts.clear()
+    fetch_top_companies.clear()
+    fetch_filter_options.clear()
+
+
 def insert_job(company, role, location, applied_date, status, salary, notes):
     """Insert a new job row into the database."""
     conn = get_connection()
-    cursor = conn.cursor()
 
-    cursor.execute(
-        """
-        INSERT INTO jobs (company, role, location, applied_date, status, salary, notes)
-        VALUES (?, ?, ?, ?, ?, ?, ?);
-        """,
-        (company, role, location, applied_date, status, salary, notes)
-    )
+    with conn:
+        conn.execute(
+            SQL_INSERT_JOB,
+            (company, role, location, applied_date, status, salary, notes)
+        )
+
+    clear_cached_queries()
+
+
+def insert_jobs_bulk(rows):
+    """Insert many job rows in a single transaction.
+
+    Each row is a (company, role, location, applied_date, status, salary, notes)
+    tuple. Dates are normalized first, so a row with an invalid date raises
+    ValueError before anything is written. Returns the number of rows inserted.
+    """
+    rows = [
+        (company, role, location, normalize_date(applied_date), status, salary, notes)
+        for company, role, location, applied_date, status, salary, notes in rows
+    ]
+
+    conn = get_connection()
 
-    conn.commit()
-    conn.close()
+    with conn:
+        cursor = conn.executemany(SQL_INSERT_JOB, rows)
+
+    clear_cached_queries()
+    return cursor.rowcount
 
 
 def get_job_by_id(job_id: int):
-    """Return one job row as dict, or None."""
+    """Return one job row (a sqlite3.Row keyed by column), or None."""
     conn = get_connection()
-    query = """
-        SELECT id, company, role, location, applied_date, status, salary, notes
-        FROM jobs
-        WHERE id = ?;
-    """
-    df = pd.read_sql_query(query, conn, params=(job_id,))
-    conn.close()
-    if df.empty:
-        return None
-    return df.iloc[0]
+    cursor = conn.execute(SQL_GET_JOB, (job_id,))
+    row = cursor.fetchone()
+    return row
 
 
 def update_job(job_id, status, applied_date, salary, notes):
     """Update fields for one job."""
     conn = get_connection()
-    cursor = conn.cursor()
 
-    cursor.execute(
-        """
-        UPDATE jobs
-        SET status = ?, applied_date = ?, salary = ?, notes = ?
-        WHERE id = ?;
-        """,
-        (status, applied_date, salary, notes, job_id)
-    )
+    with conn:
+        conn.execute(
+            SQL_UPDATE_JOB,
+            (status, applied_date, salary, notes, job_id)
+        )
 
-    conn.commit()
-    conn.close()
+    clear_cached_queries()
 
 
 def delete_job(job_id):
     """Delete job by id."""
     conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM jobs WHERE id = ?;", (job_id,))
-    conn.commit()
-    conn.close()
+    with conn:
+        conn.execute(SQL_DELETE_JOB, (job_id,))
+    clear_cached_queries()
 
 
 # ---------- STREAMLIT PAGES ----------
@@ -116,17 +243,18 @@ def delete_job(job_id):
 def page_dashboard():
     st.header("📊 Dashboard – Applications Overview")
 
-    df = fetch_all_jobs()
+    status_counts = fetch_status_counts()
 
-    if df.empty:
+    if not status_counts:
         st.info("No job applications yet. Add some from the **Add Job** page.")
         return
 
     # --- FILTERS (SIDEBAR) ---
     st.sidebar.subheader("🔎 Filters")
 
+    all_statuses, companies = fetch_filter_options()
+
     # status filter
-    all_statuses = sorted(df["status"].dropna().unique().tolist())
     status_filter = st.sidebar.multiselect(
         "Status",
         options=all_statuses,
@@ -134,7 +262,6 @@ def page_dashboard():
     )
 
     # company filter
-    companies = sorted(df["company"].dropna().unique().tolist())
     company_filter = st.sidebar.multiselect(
         "Company",
         options=companies,
@@ -144,57 +271,72 @@ def page_dashboard():
     # search text (company / role / location)
     search_text = st.sidebar.text_input("Search (company / role / location)")
 
-    # apply filters
-    filtered = df.copy()
-
-    if status_filter:
-        filtered = filtered[filtered["status"].isin(status_filter)]
-    if company_filter:
-        filtered = filtered[filtered["company"].isin(company_filter)]
-    if search_text.strip():
-        s = search_text.strip().lower()
-        mask = (
-            filtered["company"].str.lower().str.contains(s)
-            | filtered["role"].str.lower().str.contains(s)
-            | filtered["location"].fillna("").str.lower().str.contains(s)
-        )
-        filtered = filtered[mask]
+    # apply filters in SQL
+    filtered = fetch_jobs(
+        tuple(status_filter),
+        tuple(company_filter),
+        search_text.strip(),
+    )
 
     # --- TOP METRICS ---
-    col1, col2, col3 = st.columns(3)
-    total_apps = len(df)
+    col1, col2, col3, col4 = st.columns(4)
+    counts = {
+        status.lower(): count
+        for status, count in status_counts
+        if status is not None
+    }
+    total_apps = sum(count for _, count in status_counts)
     total_filtered = len(filtered)
-    num_interview = (df["status"].str.lower() == "interview").sum()
-    num_offer = (df["status"].str.lower() == "offer").sum()
+    num_interview = counts.get("interview", 0)
+    num_offer = counts.get("offer", 0)
 
     col1.metric("Total applications", total_apps)
     col2.metric("Filtered shown", total_filtered)
-    col3.metric("Offers", int(num_offer))
+    col3.metric("Interviews", num_interview)
+    col4.metric("Offers", num_offer)
+
+    # display formatting, done column-wise rather than per row; salary
+    # stays numeric so sorting the column in the table still works
+    display = filtered.assign(
+        applied_date=filtered["applied_date"].fillna("-").replace("", "-"),
+    )
 
     st.subheader("📋 Applications (filtered)")
-    st.dataframe(filtered, use_container_width=True, height=350)
+    st.dataframe(
+        display,
+        use_container_width=True,
+        height=350,
+        column_config={
+            "salary": st.column_config.NumberColumn(format="%.0f"),
+        },
+    )
 
     # --- SIMPLE STATS & CHARTS ---
     st.subheader("📈 Status breakdown")
-    status_counts = (
-        df["status"]
-        .fillna("Unknown")
-        .value_counts()
-        .rename_axis("status")
-        .reset_index(name="count")
+    # missing and blank statuses share one "Unknown" bar
+    chart_counts = {}
+    for status, count in status_counts:
+        label = status or "Unknown"
+        chart_counts[label] = chart_counts.get(label, 0) + count
+    st.bar_chart(
+        {
+            "status": list(chart_counts),
+            "count": list(chart_counts.values()),
+        },
+        x="status",
+        y="count",
     )
-    st.bar_chart(status_counts, x="status", y="count")
 
     st.subheader("🏢 Top companies by applications")
-    company_counts = (
-        df["company"]
-        .fillna("Unknown")
-        .value_counts()
-        .head(10)
-        .rename_axis("company")
-        .reset_index(name="count")
+    company_counts = fetch_top_companies()
+    st.bar_chart(
+        {
+            "company": [company for company, _ in company_counts],
+            "count": [count for _, count in company_counts],
+        },
+        x="company",
+        y="count",
     )
-    st.bar_chart(company_counts, x="company", y="count")
 
 
 def page_add_job():
@@ -236,11 +378,18 @@ def page_add_job():
                     st.warning("Invalid salary. Saving as empty.")
                     salary = None
 
+            # date handling: store canonical YYYY-MM-DD
+            try:
+                applied_date = normalize_date(applied_date.strip())
+            except ValueError:
+                st.warning("Invalid date (use YYYY-MM-DD). Saving as empty.")
+                applied_date = ""
+
             insert_job(
                 company.strip(),
                 role.strip(),
                 location.strip(),
-                applied_date.strip(),
+                applied_date,
                 status.strip(),
                 salary,
                 notes.strip(),
@@ -279,17 +428,17 @@ def page_manage_jobs():
         new_status = st.selectbox(
             "Status",
             ["Applied", "Online Test", "Interview", "Rejected", "Offer", "Other"],
-            index=0 if pd.isna(job["status"]) else 0,
+            index=0 if job["status"] is None else 0,
             help="Update the current status.",
         )
         # pre-select current status if present
-        if not pd.isna(job["status"]) and job["status"] in new_status:
+        if job["status"] is not None and job["status"] in new_status:
             pass  # not perfect, but simple; we keep selected option list small
 
         new_date = st.text_input("Applied Date", job["applied_date"] or "")
 
     with col_right:
-        salary_str = "" if pd.isna(job["salary"]) else str(job["salary"])
+        salary_str = "" if job["salary"] is None else str(job["salary"])
         new_salary_input = st.text_input("Salary", salary_str)
         new_notes = st.text_area("Notes", job["notes"] or "", height=120)
 
@@ -306,10 +455,17 @@ def page_manage_jobs():
                 st.warning("Invalid salary. Keeping old value.")
                 new_salary = job["salary"]
 
+        # handle date
+        try:
+            new_date = normalize_date(new_date.strip())
+        except ValueError:
+            st.warning("Invalid date (use YYYY-MM-DD). Keeping old value.")
+            new_date = job["applied_date"]
+
         update_job(
             job_id=int(job["id"]),
             status=new_status,
-            applied_date=new_date.strip(),
+            applied_date=new_date,
             salary=new_salary,
             notes=new_notes.strip(),
         )